@@ -1,23 +1,28 @@
 from ggpk_parser import GGPKParser
-import os
+from collections import OrderedDict
 
 class GGPKFileSystem:
     """
     File system interface for GGPK files.
     Example usage:
-        parser = GGPKParser('Content.ggpk')
-        parser.parse()
-        fs = GGPKFileSystem(parser)
-        
-        # List root directory
-        print(fs.listdir('/'))
-        
-        # Read a file
-        data = fs.read_file('/Metadata/QuestAchievements.dat')
+        with GGPKParser('Content.ggpk') as parser:
+            parser.parse()
+            fs = GGPKFileSystem(parser)
+
+            # List root directory
+            print(fs.listdir('/'))
+
+            # Read a file
+            data = fs.read_file('/Metadata/QuestAchievements.dat')
     """
-    def __init__(self, parser: GGPKParser):
+    def __init__(self, parser: GGPKParser, cache_limit: int = 64 * 1024 * 1024):
         self.parser = parser
         self.current_path = '/'
+        # Recently read file contents, least recently used first,
+        # bounded by total size in bytes rather than entry count
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_limit = cache_limit
         
     def listdir(self, path: str = None) -> list:
         """
@@ -36,10 +41,21 @@ class GGPKFileSystem:
         return list(node.children.keys())
         
     def abspath(self, path: str) -> str:
-        """Convert relative path to absolute path"""
-        if path.startswith('/'):
-            return path
-        return os.path.normpath(os.path.join(self.current_path, path)).replace('\\', '/')
+        """Convert relative path to normalized absolute path"""
+        if not path.startswith('/'):
+            path = self.current_path.rstrip('/') + '/' + path
+        # GGPK paths are always '/'-separated, so normalize them directly
+        # rather than through the platform's os.path rules
+        parts = []
+        for part in path.split('/'):
+            if not part or part == '.':
+                continue
+            if part == '..':
+                if parts:
+                    parts.pop()
+            else:
+                parts.append(part)
+        return '/' + '/'.join(parts)
         
     def join(self, base: str, *paths) -> str:
         """Join path components using '/' separator"""
@@ -77,7 +93,20 @@ class GGPKFileSystem:
         :param path: Full path to file in GGPK
         :return: File contents as bytes
         """
-        return self.parser.read_file(self.abspath(path))
+        path = self.abspath(path)
+        data = self._cache.get(path)
+        if data is not None:
+            self._cache.move_to_end(path)
+            return data
+
+        data = self.parser.read_file(path)
+        if len(data) <= self._cache_limit:
+            self._cache[path] = data
+            self._cache_bytes += len(data)
+            while self._cache_bytes > self._cache_limit:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+        return data
         
     def get_size(self, path: str) -> int:
         """
@@ -96,11 +125,11 @@ class GGPKFileSystem:
 
 if __name__ == '__main__':
     # Example usage
-    parser = GGPKParser('Content.ggpk')
-    parser.parse()
-    fs = GGPKFileSystem(parser)
-    
-    print("Root directory contents:")
-    for item in fs.listdir('/'):
-        full_path = fs.join('/', item)
-        print(f" - {item} {'(dir)' if fs.isdir(full_path) else ''}")
\ No newline at end of file
+    with GGPKParser('Content.ggpk') as parser:
+        parser.parse()
+        fs = GGPKFileSystem(parser)
+        
+        print("Root directory contents:")
+        for item in fs.listdir('/'):
+            full_path = fs.join('/', item)
+            print(f" - {item} {'(dir)' if fs.isdir(full_path) else ''}")
\ No newline at end of file
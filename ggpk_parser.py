@@ -1,8 +1,62 @@
 import os
+import re
+import sys
+import mmap
+import functools
 import struct
 import io
+import logging
 import warnings
-from typing import Dict, Union, List, Optional
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Union, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Length and tag shared by every record
+_RECORD_HDR = struct.Struct('<I4s')
+# Fixed-size fields following the header of each record type
+_GGPK_HDR = struct.Struct('<iqq')
+_PDIR_HDR = struct.Struct('<ii32s')
+_FILE_HDR = struct.Struct('<i32s')
+# Directory entry: name hash + record offset
+_ENTRY = struct.Struct('<Iq')
+# Any record tag, used to resync after a corrupt record
+_TAG_RE = re.compile(b'GGPK|PDIR|FILE|FREE')
+
+def _make_name_reader(version: int):
+    """
+    Build a record name decoder specialized for a GGPK version, so the
+    character width and encoding aren't re-derived for every record
+    """
+    # Version 4 uses UTF-32 names, earlier versions UTF-16
+    wchar_width = 4 if version == 4 else 2
+    encoding = 'utf-32-le' if version == 4 else 'utf-16-le'
+
+    def read_name(buf: mmap.mmap, pos: int, name_length: int) -> Tuple[str, int]:
+        """
+        Decode a null-terminated record name of name_length characters.
+        Returns the name and the position following the terminator.
+        """
+        end = pos + wchar_width * name_length
+        name = buf[pos:end].decode(encoding).rstrip('\x00')
+        # Names like 'Art' or 'Metadata' repeat throughout the archive
+        if len(name) < 64:
+            name = sys.intern(name)
+        return name, end
+
+    return read_name
+
+def _pread(f: io.BufferedReader, length: int, offset: int) -> bytes:
+    """
+    Read length bytes at offset in a single call that leaves the shared
+    file position untouched, so it is safe to use from several threads
+    """
+    if hasattr(os, 'pread'):
+        return os.pread(f.fileno(), length, offset)
+    # No pread on Windows, fall back to seek + read
+    f.seek(offset)
+    return f.read(length)
 
 class GGPKException(Exception):
     pass
@@ -14,6 +68,7 @@ class BaseRecord:
     """
     Base class for GGPK records
     """
+    __slots__ = ('container', 'length', 'offset')
     tag = None
 
     def __init__(self, container, length: int, offset: int):
@@ -21,42 +76,36 @@ class BaseRecord:
         self.length = length
         self.offset = offset
 
-    def read(self, ggpkfile: io.BufferedReader):
+    def read(self, buf: mmap.mmap, pos: int) -> int:
         """
-        Read record data from GGPK file
+        Read record data from the mapped GGPK file, starting just past the
+        record header. Returns the position following the record.
         """
-        pass
+        return self.offset + self.length
 
 class GGPKRecord(BaseRecord):
     """
     Master record of the GGPK file
     """
+    __slots__ = ('version', 'offsets')
     tag = b'GGPK'
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.version = 0
-        self.offsets = []
-
-    def read(self, ggpkfile: io.BufferedReader):
-        self.version = struct.unpack('<i', ggpkfile.read(4))[0]
-        self.offsets = [
-            struct.unpack('<q', ggpkfile.read(8))[0],
-            struct.unpack('<q', ggpkfile.read(8))[0]
-        ]
+        self.offsets = ()
 
-class DirectoryRecordEntry:
-    """
-    Entry in a directory record
-    """
-    def __init__(self, hash: int, offset: int):
-        self.hash = hash
-        self.offset = offset
+    def read(self, buf: mmap.mmap, pos: int) -> int:
+        end = pos + _GGPK_HDR.size
+        self.version, offset1, offset2 = _GGPK_HDR.unpack(buf[pos:end])
+        self.offsets = (offset1, offset2)
+        return end
 
 class DirectoryRecord(BaseRecord):
     """
     Represents a directory in the GGPK file
     """
+    __slots__ = ('name', 'name_length', 'entries_length', 'hash', 'entry_hashes', 'entry_offsets')
     tag = b'PDIR'
 
     def __init__(self, *args, **kwargs):
@@ -65,33 +114,28 @@ class DirectoryRecord(BaseRecord):
         self.name_length = 0
         self.entries_length = 0
         self.hash = b''
-        self.entries = []
+        # Entries are kept as parallel compact arrays rather than objects
+        self.entry_hashes = array('I')
+        self.entry_offsets = array('q')
 
-    def read(self, ggpkfile: io.BufferedReader):
-        self.name_length = struct.unpack('<i', ggpkfile.read(4))[0]
-        self.entries_length = struct.unpack('<i', ggpkfile.read(4))[0]
-        self.hash = ggpkfile.read(32)
-        
-        # Determine character width based on GGPK version
-        wchar_width = 4 if self.container.version == 4 else 2
-        encoding = 'utf-32-le' if self.container.version == 4 else 'utf-16-le'
-        
-        # Read and decode name
-        name_bytes = ggpkfile.read(wchar_width * (self.name_length - 1))
-        self.name = name_bytes.decode(encoding)
-        ggpkfile.seek(wchar_width, os.SEEK_CUR)  # Skip null terminator
+    def read(self, buf: mmap.mmap, pos: int) -> int:
+        self.name_length, self.entries_length, self.hash = _PDIR_HDR.unpack(buf[pos:pos + _PDIR_HDR.size])
+        pos += _PDIR_HDR.size
+        self.name, pos = self.container._read_name(buf, pos, self.name_length)
         
-        # Read directory entries
-        self.entries = []
-        for _ in range(self.entries_length):
-            entry_hash = struct.unpack('<I', ggpkfile.read(4))[0]
-            entry_offset = struct.unpack('<q', ggpkfile.read(8))[0]
-            self.entries.append(DirectoryRecordEntry(entry_hash, entry_offset))
+        # Read all directory entries in one go
+        entries_end = pos + _ENTRY.size * self.entries_length
+        if self.entries_length:
+            hashes, offsets = zip(*_ENTRY.iter_unpack(buf[pos:entries_end]))
+            self.entry_hashes = array('I', hashes)
+            self.entry_offsets = array('q', offsets)
+        return entries_end
 
 class FileRecord(BaseRecord):
     """
     Represents a file in the GGPK file
     """
+    __slots__ = ('name', 'name_length', 'hash', 'data_start', 'data_length')
     tag = b'FILE'
 
     def __init__(self, *args, **kwargs):
@@ -102,54 +146,54 @@ class FileRecord(BaseRecord):
         self.data_start = 0
         self.data_length = 0
 
-    def read(self, ggpkfile: io.BufferedReader):
-        self.name_length = struct.unpack('<i', ggpkfile.read(4))[0]
-        self.hash = ggpkfile.read(32)
-        
-        # Determine character width based on GGPK version
-        wchar_width = 4 if self.container.version == 4 else 2
-        encoding = 'utf-32-le' if self.container.version == 4 else 'utf-16-le'
-        
-        # Read and decode name
-        name_bytes = ggpkfile.read(wchar_width * (self.name_length - 1))
-        self.name = name_bytes.decode(encoding)
-        ggpkfile.seek(wchar_width, os.SEEK_CUR)  # Skip null terminator
+    def read(self, buf: mmap.mmap, pos: int) -> int:
+        self.name_length, self.hash = _FILE_HDR.unpack(buf[pos:pos + _FILE_HDR.size])
+        pos += _FILE_HDR.size
+        self.name, pos = self.container._read_name(buf, pos, self.name_length)
         
-        # Calculate data position and length
-        self.data_start = ggpkfile.tell()
-        self.data_length = self.length - 44 - self.name_length * wchar_width
-        ggpkfile.seek(self.data_length, os.SEEK_CUR)
+        # Data takes up the rest of the record
+        self.data_start = pos
+        self.data_length = self.offset + self.length - pos
+        return pos + self.data_length
 
-    def extract(self, ggpkfile: io.BufferedReader) -> bytes:
+    def extract(self, buf: mmap.mmap) -> bytes:
         """
         Extract file content from GGPK
         """
-        current_pos = ggpkfile.tell()
-        ggpkfile.seek(self.data_start)
-        data = ggpkfile.read(self.data_length)
-        ggpkfile.seek(current_pos)
-        return data
+        return buf[self.data_start:self.data_start + self.data_length]
 
-class FreeRecord(BaseRecord):
+class _FileView:
     """
-    Represents free space in the GGPK file
+    Minimal read-only stand-in for an mmap, used when the GGPK can't be
+    mapped (e.g. larger than the address space on 32-bit builds)
     """
-    tag = b'FREE'
+    def __init__(self, f: io.BufferedReader):
+        self._f = f
+        self._size = os.fstat(f.fileno()).st_size
 
-    def read(self, ggpkfile: io.BufferedReader):
-        self.next_free = struct.unpack('<q', ggpkfile.read(8))[0]
-        ggpkfile.seek(self.length - 16, os.SEEK_CUR)
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, key: slice) -> bytes:
+        start, stop, _ = key.indices(self._size)
+        return _pread(self._f, max(0, stop - start), start)
+
+    def close(self):
+        pass
 
 class DirectoryNode:
     """
     Node in the GGPK directory tree
     """
+    __slots__ = ('name', 'is_directory', 'record', 'parent', 'children', 'hash')
+
     def __init__(self, name: str, is_directory: bool, record: BaseRecord, parent: Optional['DirectoryNode'] = None):
         self.name = name
         self.is_directory = is_directory
         self.record = record
         self.parent = parent
-        self.children = {}
+        # Files never have children, so they don't get a dict of their own
+        self.children = {} if is_directory else None
         self.hash = None
 
     def add_child(self, node: 'DirectoryNode'):
@@ -163,72 +207,124 @@ class DirectoryNode:
             return os.path.join(self.parent.get_path(), self.name)
         return self.name
 
+def _ggpk_path(node: DirectoryNode) -> str:
+    """
+    Full path of a node as used by the parser's indexes and read_file(),
+    e.g. '/Data/a.dat'; unlike get_path() it is always '/'-separated and rooted.
+    """
+    names = []
+    while node.parent is not None:
+        names.append(node.name)
+        node = node.parent
+    return '/' + '/'.join(reversed(names))
+
 class GGPKParser:
     """
     Main GGPK parser class
     """
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, verbose: bool = False):
         self.file_path = file_path
+        self.verbose = verbose
         self.records = {}
         self.root = None
         self.version = 0
+        self._read_name = _make_name_reader(self.version)
+        self._fh = None
+        self._mm = None
+        self._path_index = {}
+        self._file_index = {}
+        # Per-instance cache so it is dropped together with the parser
+        self._resolve = functools.lru_cache(maxsize=4096)(self._resolve_impl)
+
+    def __enter__(self) -> 'GGPKParser':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # __init__ may have failed before the handles were set
+        if getattr(self, '_mm', None) is not None or getattr(self, '_fh', None) is not None:
+            self.close()
+
+    def close(self):
+        """
+        Release the file handle and mapping held since parse()
+        """
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def _check_open(self):
+        if self._mm is None:
+            raise ValueError("GGPKParser is closed")
 
     def parse(self):
         """
         Parse the GGPK file and build directory tree
         """
-        with open(self.file_path, 'rb') as f:
-            # Read all records - the first record should be a GGPKRecord
-            self._read_records(f)
+        self.close()
+        self._fh = open(self.file_path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OverflowError, OSError, ValueError):
+            # Too large to map into this process (or empty), fall back to stdio
+            self._mm = _FileView(self._fh)
+
+        # Read all records - the first record should be a GGPKRecord
+        self._read_records(self._mm)
+        
+        # Get the first record (should be at offset 0)
+        ggpk_record = self.records.get(0)
+        if not isinstance(ggpk_record, GGPKRecord):
+            raise GGPKException("First record is not a GGPKRecord")
             
-            # Get the first record (should be at offset 0)
-            ggpk_record = self.records.get(0)
-            if not isinstance(ggpk_record, GGPKRecord):
-                raise GGPKException("First record is not a GGPKRecord")
-                
-            self.version = ggpk_record.version
-            if not ggpk_record.offsets:
-                raise GGPKException("GGPKRecord has no directory pointers")
-                
-            # Use the first offset as the directory pointer
-            dir_pointer = ggpk_record.offsets[0]
+        self.version = ggpk_record.version
+        if not ggpk_record.offsets:
+            raise GGPKException("GGPKRecord has no directory pointers")
             
-            # Build directory tree starting from root
-            self.root = self._build_directory_tree(dir_pointer, None)
+        # Use the first offset as the directory pointer
+        dir_pointer = ggpk_record.offsets[0]
+        
+        # Build directory tree starting from root
+        self.root = self._build_directory_tree(dir_pointer, None)
+        self._resolve.cache_clear()
 
-    def _read_records(self, f: io.BufferedReader):
+    def _read_records(self, buf: mmap.mmap):
         """
         Read all records in the GGPK file with improved error handling
         """
-        f.seek(0)
-        size = os.fstat(f.fileno()).st_size
+        size = len(buf)
         offset = 0
         chunk_size = 1048576  # 1MB chunks for error recovery
         
         # Progress reporting for large files
-        print(f"Reading {size:,} bytes...")
+        verbose = self.verbose
+        if verbose:
+            logger.info(f"Reading {size:,} bytes...")
         last_report = 0
         
         while offset < size:
             # Report progress every 10%
-            if offset - last_report > size // 10:
-                print(f"  Progress: {offset/size:.0%}")
+            if verbose and offset - last_report > size // 10:
+                logger.info(f"  Progress: {offset/size:.0%}")
                 last_report = offset
                 
             try:
                 # Read record length and tag
-                length_bytes = f.read(4)
-                if len(length_bytes) < 4:
+                header = buf[offset:offset + _RECORD_HDR.size]
+                if len(header) < _RECORD_HDR.size:
                     break
                     
-                length = struct.unpack('<I', length_bytes)[0]
-                tag = f.read(4)
+                length, tag = _RECORD_HDR.unpack(header)
                 
                 # Validate length
                 if length < 8 or offset + length > size:
                     warnings.warn(f"Invalid record length {length} at offset {offset}")
                     offset += 4  # Skip this length field and try next
-                    f.seek(offset)
                     continue
                 
                 # Create appropriate record type
@@ -239,68 +335,92 @@ class GGPKParser:
                 elif tag == b'FILE':
                     record = FileRecord(self, length, offset)
                 elif tag == b'FREE':
-                    record = FreeRecord(self, length, offset)
+                    # Free space never appears in the tree, so just step over it
+                    offset += length
+                    continue
                 else:
                     raise InvalidTagException(f"Invalid tag: {tag} at offset {offset}")
                 
                 # Read record content and store
-                record.read(f)
+                next_offset = record.read(buf, offset + _RECORD_HDR.size)
                 self.records[offset] = record
-                offset = f.tell()
+                if tag == b'GGPK':
+                    # Names in every following record depend on the version
+                    self.version = record.version
+                    self._read_name = _make_name_reader(record.version)
+                offset = next_offset
                 
             except Exception as e:
                 warnings.warn(f"Error reading record at offset {offset}: {str(e)}")
                 # Attempt to find next valid record in larger chunks
-                f.seek(offset)
-                chunk = f.read(chunk_size)
+                chunk = buf[offset:offset + chunk_size]
                 if not chunk:
                     break
                     
-                # Look for next valid tag in larger chunk
+                # Look for the next valid tag in a single pass over the chunk
                 found = False
-                for tag in (b'GGPK', b'PDIR', b'FILE', b'FREE'):
-                    pos = chunk.find(tag)
-                    if pos != -1:
-                        new_offset = offset + pos - 4  # Position before tag
-                        # Validate potential length field
-                        f.seek(new_offset)
-                        len_bytes = f.read(4)
-                        if len(len_bytes) == 4:
-                            try:
-                                potential_len = struct.unpack('<I', len_bytes)[0]
-                                if 8 <= potential_len <= size - new_offset:
-                                    offset = new_offset
-                                    f.seek(offset)
-                                    found = True
-                                    break
-                            except:
-                                pass
+                for match in _TAG_RE.finditer(chunk):
+                    new_offset = offset + match.start() - 4  # Position before tag
+                    if new_offset <= offset:
+                        continue  # The record that just failed
+                    # Validate potential length field
+                    len_bytes = buf[new_offset:new_offset + 4]
+                    potential_len = struct.unpack('<I', len_bytes)[0]
+                    if 8 <= potential_len <= size - new_offset:
+                        offset = new_offset
+                        found = True
+                        break
                 
                 if not found:
                     # Skip ahead by chunk size if nothing found
                     offset += chunk_size - 4
-                    f.seek(offset)
 
     def _build_directory_tree(self, offset: int, parent: Optional[DirectoryNode]) -> DirectoryNode:
         """
-        Recursively build directory tree from records
+        Build directory tree from records, using an explicit stack rather
+        than recursion so deep trees can't hit the recursion limit.
+        Also fills the full path -> node and full path -> file record indexes.
         """
-        record = self.records.get(offset)
-        if not record:
-            raise GGPKException(f"Missing record at offset {offset}")
-            
-        if isinstance(record, DirectoryRecord):
-            node = DirectoryNode(record.name, True, record, parent)
-            for entry in record.entries:
-                child_node = self._build_directory_tree(entry.offset, node)
-                node.add_child(child_node)
-            return node
-            
-        elif isinstance(record, FileRecord):
-            return DirectoryNode(record.name, False, record, parent)
-            
-        else:
-            raise GGPKException(f"Unexpected record type at offset {offset}: {type(record).__name__}")
+        root = None
+        self._path_index = {}
+        self._file_index = {}
+        # (record offset, parent node, parent's full path)
+        stack = [(offset, parent, '')]
+        # A record reached twice means a corrupt directory entry that would
+        # otherwise loop forever (e.g. one pointing back at an ancestor)
+        visited = set()
+        while stack:
+            offset, parent, parent_path = stack.pop()
+            if offset in visited:
+                raise GGPKException(f"Directory entry revisits the record at offset {offset}")
+            visited.add(offset)
+            record = self.records.get(offset)
+            if not record:
+                raise GGPKException(f"Missing record at offset {offset}")
+
+            path = parent_path + '/' + record.name if root is not None else '/'
+                
+            if isinstance(record, DirectoryRecord):
+                node = DirectoryNode(record.name, True, record, parent)
+                # Children of the root are joined onto '' rather than '/'
+                child_prefix = path if root is not None else ''
+                # Pushed in reverse so children are added in on-disk order
+                for entry_offset in reversed(record.entry_offsets):
+                    stack.append((entry_offset, node, child_prefix))
+                    
+            elif isinstance(record, FileRecord):
+                node = DirectoryNode(record.name, False, record, parent)
+                self._file_index[path] = record
+                
+            else:
+                raise GGPKException(f"Unexpected record type at offset {offset}: {type(record).__name__}")
+
+            self._path_index[path] = node
+            if root is None:
+                root = node
+            else:
+                parent.add_child(node)
+        return root
 
     def extract_file(self, node: DirectoryNode) -> bytes:
         """
@@ -308,9 +428,51 @@ class GGPKParser:
         """
         if not isinstance(node.record, FileRecord):
             raise ValueError("Node is not a file")
+        self._check_open()
             
-        with open(self.file_path, 'rb') as f:
-            return node.record.extract(f)
+        return node.record.extract(self._mm)
+    
+    def extract_many(self, nodes: List[DirectoryNode]) -> Dict[str, bytes]:
+        """
+        Extract several file nodes at once, reading them in parallel.
+        
+        :param nodes: File nodes to extract
+        :return: Mapping of each node's GGPK path (e.g. '/Data/a.dat') to file contents
+        """
+        for node in nodes:
+            if not isinstance(node.record, FileRecord):
+                raise ValueError(f"Node is not a file: {node.get_path()}")
+        self._check_open()
+
+        if not hasattr(os, 'pread'):
+            # Without pread the threads would fight over one file position
+            return {_ggpk_path(node): self.extract_file(node) for node in nodes}
+
+        # pread releases the GIL, unlike copying out of the mapping, so
+        # the reads genuinely overlap
+        def extract(node: DirectoryNode):
+            record = node.record
+            return _ggpk_path(node), _pread(self._fh, record.data_length, record.data_start)
+
+        with ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) * 2)) as executor:
+            return dict(executor.map(extract, nodes))
+    
+    def prefetch(self, records: List[FileRecord]):
+        """
+        Ask the OS to start reading the given files' data in the background,
+        so later extracts of cold files don't each wait on the disk in turn.
+        This is only a hint, and does nothing where it isn't supported.
+        """
+        if isinstance(self._mm, mmap.mmap):
+            if not hasattr(mmap, 'MADV_WILLNEED'):
+                return
+            for record in records:
+                # madvise() needs a page-aligned start
+                start = record.data_start - record.data_start % mmap.PAGESIZE
+                self._mm.madvise(mmap.MADV_WILLNEED, start, record.data_start + record.data_length - start)
+        elif self._fh is not None and hasattr(os, 'posix_fadvise'):
+            for record in records:
+                os.posix_fadvise(self._fh.fileno(), record.data_start, record.data_length, os.POSIX_FADV_WILLNEED)
     
     def get_node_by_path(self, path: str) -> Optional[DirectoryNode]:
         """
@@ -322,16 +484,12 @@ class GGPKParser:
         if not path or path == '/':
             return self.root
             
+        return self._resolve(path)
+
+    def _resolve_impl(self, path: str) -> Optional[DirectoryNode]:
+        # Normalize so '/a/b', 'a/b/' and '/a//b' share an index entry
         parts = [p for p in path.split('/') if p]
-        current = self.root
-        
-        for part in parts:
-            if not current or not current.is_directory:
-                return None
-            if part not in current.children:
-                return None
-            current = current.children[part]
-        return current
+        return self._path_index.get('/' + '/'.join(parts))
 
     def list_directory(self, path: str) -> list:
         """
@@ -356,6 +514,12 @@ class GGPKParser:
         :param path: Full path to file in GGPK
         :return: File contents as bytes
         """
+        record = self._file_index.get(path)
+        if record is not None:
+            self._check_open()
+            return record.extract(self._mm)
+
+        # Unnormalized path or not a file; resolve it the slow way
         node = self.get_node_by_path(path)
         if not node:
             raise FileNotFoundError(f"File not found: {path}")
@@ -379,22 +543,77 @@ class GGPKParser:
         else:
             print(f"{prefix}{node.name}")
 
+def extract_dat_files_iter(ggpk_path: str, paths: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, bytes]]:
+    """
+    Extract the .dat files from a GGPK one at a time, without writing them to disk.
+    
+    :param ggpk_path: Path to the GGPK file
+    :param paths: Paths in the GGPK to extract, in order; all .dat and .dat64 files if omitted.
+                  Paths that aren't files in the GGPK are skipped with a warning.
+    :return: Iterator of (path in GGPK, file contents) tuples
+    """
+    with GGPKParser(ggpk_path) as parser:
+        parser.parse()
+        if paths is None:
+            paths = [path for path in parser._file_index if path.endswith(('.dat', '.dat64'))]
+        else:
+            paths = list(paths)
+        # Queue the reads for every file up front rather than one at a time
+        parser.prefetch([parser._file_index[path] for path in paths if path in parser._file_index])
+        for path in paths:
+            try:
+                data = parser.read_file(path)
+            except (FileNotFoundError, IsADirectoryError) as e:
+                # Skip it rather than abandon the files still to come
+                logger.warning("Not extracting %s: %s", path, e)
+                continue
+            yield path, data
+
+def extract_dat_files(ggpk_path: str, out_dir: str) -> List[str]:
+    """
+    Extract the .dat files from a GGPK to disk, keeping their directory layout.
+    
+    :param ggpk_path: Path to the GGPK file
+    :param out_dir: Directory to write the files under
+    :return: Absolute paths of the written files, so callers needn't walk out_dir
+    """
+    out_dir = os.path.abspath(out_dir)
+    written = []
+    made_dirs = set()
+    for path, data in extract_dat_files_iter(ggpk_path):
+        parts = path.strip('/').split('/')
+        # Names come from the GGPK, so don't let a crafted one escape out_dir
+        if any(part in ('', '.', '..') or os.sep in part or (os.altsep and os.altsep in part)
+               for part in parts):
+            raise GGPKException(f"Refusing to extract unsafe path: {path}")
+        out_path = os.path.join(out_dir, *parts)
+        if os.path.commonpath([out_dir, out_path]) != out_dir:
+            raise GGPKException(f"Refusing to extract unsafe path: {path}")
+        parent = os.path.dirname(out_path)
+        if parent not in made_dirs:
+            os.makedirs(parent, exist_ok=True)
+            made_dirs.add(parent)
+        with open(out_path, 'wb') as f:
+            f.write(data)
+        written.append(out_path)
+    return written
+
 if __name__ == '__main__':
     try:
-        parser = GGPKParser('Content.ggpk')
-        parser.parse()
-        
-        print("GGPK file structure:")
-        parser.print_tree()
-        
-        print("\nFirst 5 files:")
-        count = 0
-        for node in parser.root.children.values():
-            if count >= 5:
-                break
-            if not node.is_directory:
-                print(f"  - {node.name}")
-                count += 1
+        with GGPKParser('Content.ggpk') as parser:
+            parser.parse()
+            
+            print("GGPK file structure:")
+            parser.print_tree()
+            
+            print("\nFirst 5 files:")
+            count = 0
+            for node in parser.root.children.values():
+                if count >= 5:
+                    break
+                if not node.is_directory:
+                    print(f"  - {node.name}")
+                    count += 1
                 
     except Exception as e:
         print(f"Error parsing GGPK file: {e}")
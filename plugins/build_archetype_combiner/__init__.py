@@ -1,7 +1,14 @@
 import os
 import json
+import mmap
 import random
 
+try:
+    # Much faster C parser; the stdlib one works just as well, only slower
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 # This path assumes the .dat files are in a dedicated directory outside the app.
 # It should be configured based on where the user's data is.
 DATA_DIR = "C:\\PathofExileData"
@@ -10,14 +17,26 @@ def load_dat_file(file_name):
     file_path = os.path.join(DATA_DIR, file_name)
     data = []
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        data.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        data.append(line)
+        with open(file_path, 'rb') as f:
+            # Empty files can't be mapped
+            if not os.fstat(f.fileno()).st_size:
+                return data
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = len(mm)
+                start = 0
+                while start < size:
+                    end = mm.find(b'\n', start)
+                    if end == -1:
+                        end = size
+                    # Decoded before stripping, as bytes.strip() leaves
+                    # non-ASCII whitespace such as U+00A0 in place
+                    line = mm[start:end].decode('utf-8').strip()
+                    start = end + 1
+                    if line:
+                        try:
+                            data.append(json_loads(line))
+                        except json.JSONDecodeError:
+                            data.append(line)
     except FileNotFoundError:
         print(f"Error: .dat file not found at {file_path}")
     except Exception as e:
@@ -1,6 +1,6 @@
 import struct
 import pprint
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Iterator, List, Any, Tuple
 
 
 class DatParser:
@@ -24,7 +24,10 @@ class DatParser:
         self.schema = self._process_schema(schema)
         self.record_width = self._calculate_record_width()
         self.field_names = list(self.schema.keys())
-        self.format_string = '<' + ''.join(s[1] for s in self.schema.values())
+        self.format_string = self._build_format_string()
+        self._struct = struct.Struct(self.format_string)
+        # Positions of the string pointer fields within an unpacked record
+        self.pointer_indices = [j for j, f in enumerate(self.schema.values()) if 'P' in f]
 
     def _process_schema(self, schema: Dict[str, Tuple[int, str]]) -> Dict[str, Tuple[str]]:
         """Sorts the schema by offset and extracts format characters."""
@@ -33,11 +36,90 @@ class DatParser:
         # Return a dictionary with just the format characters, maintaining order
         return {k: v[1] for k, v in sorted_items}
 
+    def _build_format_string(self) -> str:
+        """Builds the struct format string for a single record."""
+        # 'P' marks a string pointer, which is stored as a 64-bit offset
+        return '<' + ''.join(self.schema.values()).replace('P', 'Q')
+
     def _calculate_record_width(self) -> int:
         """Calculates the total width of a single record from the schema."""
         # Use struct.calcsize on the full format string to get width
-        format_string = '<' + ''.join(self.schema.values())
-        return struct.calcsize(format_string)
+        return struct.calcsize(self._build_format_string())
+
+    @staticmethod
+    def _index_strings(variable_data_block: bytes) -> Dict[int, str]:
+        """Maps the offset of every null-terminated string in the variable data block to its value."""
+        strings = {}
+        offset = 0
+        # The last piece has no terminator, so it isn't a complete string
+        for chunk in variable_data_block.split(b'\x00')[:-1]:
+            strings[offset] = chunk.decode('utf-8', errors='ignore')
+            offset += len(chunk) + 1
+        return strings
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily parses the .dat64 file, one record at a time.
+
+        Unlike parse(), errors are raised rather than reported, and a caller
+        that stops early never builds the remaining records.
+
+        Yields:
+            A dictionary for each record, in file order.
+        """
+        with open(self.file_path, 'rb') as f:
+            # First 8 bytes are the record count (unsigned long long)
+            record_count_bytes = f.read(8)
+            if not record_count_bytes:
+                print(f"Warning: File '{self.file_path}' is empty.")
+                return
+            
+            record_count = struct.unpack('<Q', record_count_bytes)[0]
+
+            # Read the fixed-width record data block
+            record_data_size = record_count * self.record_width
+            record_data_block = f.read(record_data_size)
+
+            if len(record_data_block) != record_data_size:
+                raise struct.error(f"expected {record_data_size} bytes of records, got {len(record_data_block)}")
+
+            # The rest of the file is the variable-length data block (for strings)
+            variable_data_block = f.read()
+
+        # Decode every string once up front instead of once per pointer
+        strings = self._index_strings(variable_data_block)
+
+        # Bound once here rather than looked up on every record
+        field_names = self.field_names
+        pointer_indices = self.pointer_indices
+        strings_get = strings.get
+        find = variable_data_block.find
+
+        # Unpack all records in a single pass over the block
+        unpacked_records = self._struct.iter_unpack(record_data_block)
+        if not pointer_indices:
+            # Nothing to resolve, the unpacked values are the record
+            for unpacked_data in unpacked_records:
+                yield dict(zip(field_names, unpacked_data))
+            return
+
+        for unpacked_data in unpacked_records:
+            values = list(unpacked_data)
+
+            # Resolve pointer ('P') fields to their strings
+            for j in pointer_indices:
+                str_offset = values[j]
+                value = strings_get(str_offset)
+                if value is None:
+                    # Pointer into the middle of a string
+                    end_of_string = find(b'\x00', str_offset)
+                    if end_of_string != -1:
+                        value = variable_data_block[str_offset:end_of_string].decode('utf-8', errors='ignore')
+                    else:
+                        value = "" # Handle cases with bad pointers or no null terminator
+                values[j] = value
+
+            yield dict(zip(field_names, values))
 
     def parse(self) -> List[Dict[str, Any]]:
         """
@@ -47,50 +129,8 @@ class DatParser:
             A list of dictionaries, where each dictionary represents a record.
             Returns an empty list if an error occurs.
         """
-        records = []
         try:
-            with open(self.file_path, 'rb') as f:
-                # First 8 bytes are the record count (unsigned long long)
-                record_count_bytes = f.read(8)
-                if not record_count_bytes:
-                    print(f"Warning: File '{self.file_path}' is empty.")
-                    return []
-                
-                record_count = struct.unpack('<Q', record_count_bytes)[0]
-
-                # Read the fixed-width record data block
-                record_data_size = record_count * self.record_width
-                record_data_block = f.read(record_data_size)
-
-                # The rest of the file is the variable-length data block (for strings)
-                variable_data_block = f.read()
-
-                # Iterate through each record in the block
-                for i in range(record_count):
-                    offset = i * self.record_width
-                    record_bytes = record_data_block[offset : offset + self.record_width]
-                    
-                    unpacked_data = struct.unpack(self.format_string, record_bytes)
-                    
-                    record_dict = {}
-                    for j, field_name in enumerate(self.field_names):
-                        value = unpacked_data[j]
-                        field_format = self.schema[field_name]
-
-                        # If the field is a pointer ('P'), resolve the string
-                        if 'P' in field_format:
-                            str_offset = value
-                            # Find the null terminator for the string
-                            end_of_string = variable_data_block.find(b'\x00', str_offset)
-                            if end_of_string != -1:
-                                value = variable_data_block[str_offset:end_of_string].decode('utf-8', errors='ignore')
-                            else:
-                                value = "" # Handle cases with bad pointers or no null terminator
-
-                        record_dict[field_name] = value
-                    
-                    records.append(record_dict)
-
+            return list(self.iter_records())
         except FileNotFoundError:
             print(f"❌ Error: The file at '{self.file_path}' was not found.")
             return []
@@ -101,8 +141,6 @@ class DatParser:
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
             return []
-            
-        return records
 
 
 # --- HOW TO USE ---
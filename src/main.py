@@ -1,28 +1,140 @@
-from ggpk_parser import parse_ggpk, extract_dat_files
-from dat_parser import parse_dat
-import tempfile
 import os
+import sys
+
+# ggpk_parser.py is in the repository root, one level above this directory
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ggpk_parser import extract_dat_files_iter
+from parse_ggpk_dat import parse_ggpk_dat
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections import deque
+import hashlib
+import pickle
+from typing import Any, Dict, List
+
+GGPK_PATH = 'Content.ggpk'
+
+# Field definitions of the DATs to parse, keyed by path in the GGPK.
+# Only files listed here are parsed; see parse_ggpk_dat() for the format.
+DAT_SCHEMAS = {
+    '/Data/BaseItemTypes.dat64': {
+        'id':               'P',  # Pointer to the item's ID string
+        'name':             'P',  # Pointer to the item's name string
+        'inventory_width':  'I',
+        'inventory_height': 'I',
+    },
+}
+
+# DATs handed to the workers but not yet printed
+MAX_IN_FLIGHT = 32
+
+# Parsed DATs from earlier runs, one directory per GGPK
+CACHE_ROOT = os.path.join(os.path.expanduser('~'), '.cache', 'poe_dat')
+# Bump whenever parse_dat() or its output changes, so older pickles aren't served
+CACHE_VERSION = 1
+
+def ggpk_cache_key(ggpk_path: str, sample_size: int = 65536) -> str:
+    """
+    Identifies a GGPK by its size, modification time and the bytes at
+    either end, without hashing the whole (multi-GB) file. The time catches
+    patches that rewrite records in place, leaving the size and ends alone.
+    """
+    st = os.stat(ggpk_path)
+    size = st.st_size
+    digest = hashlib.blake2b(f'{size}:{st.st_mtime_ns}'.encode(), digest_size=16)
+    with open(ggpk_path, 'rb') as f:
+        digest.update(f.read(sample_size))
+        f.seek(max(size - sample_size, 0))
+        digest.update(f.read(sample_size))
+    return digest.hexdigest()
+
+def cache_file(cache_dir: str, path: str, field_definitions: Dict[str, str]) -> str:
+    """
+    Where a DAT's parsed records are cached. The name includes the schema,
+    so editing a schema in DAT_SCHEMAS doesn't return records parsed with the old one.
+    """
+    schema_key = hashlib.blake2b(repr(list(field_definitions.items())).encode(), digest_size=8).hexdigest()
+    return os.path.join(cache_dir, f"{path.lstrip('/')}.{schema_key}.pickle")
+
+def load_cached(cache_path: str):
+    """Returns a finished Future holding the cached result, or None on a miss."""
+    try:
+        with open(cache_path, 'rb') as f:
+            data = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None  # Not cached yet, or a partial write from a killed run
+    future = Future()
+    future.set_result(data)
+    return future
+
+def store_cached(cache_path: str, data):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    # Written aside and renamed, so readers never see a partial file
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+def parse_dat(data: bytes, field_definitions: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Parses one DAT's contents into records. Runs in the worker processes,
+    so it must stay a top-level function for the pool to pickle it.
+    Raises on failure, so that an error is never cached as an empty result.
+    """
+    return parse_ggpk_dat(data, field_definitions, strict=True).to_pylist()
 
 def main():
-    # Parse the GGPK file to get the list of files (though now extract_dat_files handles DAT extraction)
-    # This line may be redundant if extract_dat_files is handling the extraction
-    # But kept for potential future use or metadata purposes
-    ggpk_files = parse_ggpk('Content.ggpk')
-    
-    # Use a temporary directory to extract and process DAT files
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Extract all DAT files to the temporary directory
-        extract_dat_files('Content.ggpk', temp_dir)
-        
-        # Iterate over all files in the temporary directory and its subdirectories
-        for root, dirs, files in os.walk(temp_dir):
-            for filename in files:
-                # Check if it's a DAT file
-                if filename.endswith('.dat'):
-                    dat_path = os.path.join(root, filename)
-                    # Parse and print the DAT file contents
-                    data = parse_dat(dat_path)
-                    print(data)
+    cache_dir = os.path.join(CACHE_ROOT, f'v{CACHE_VERSION}-{ggpk_cache_key(GGPK_PATH)}')
+    # Results are written straight to the stream and flushed once at the
+    # end, rather than print()ing (and possibly flushing) each one
+    write = sys.stdout.write
+
+    # Check the cache before touching the GGPK, so a fully cached run never
+    # parses its directory tree or copies a DAT out of it
+    cached = {path: load_cached(cache_file(cache_dir, path, field_definitions))
+              for path, field_definitions in DAT_SCHEMAS.items()}
+    misses = [path for path, future in cached.items() if future is None]
+    extracted = extract_dat_files_iter(GGPK_PATH, misses) if misses else iter(())
+
+    # Parse each DAT as soon as it is read out of the GGPK, instead of
+    # extracting them all to disk and walking the directory afterwards.
+    # Parsing is CPU-bound, so spread the files over all cores.
+    with ProcessPoolExecutor() as executor:
+        pending = deque()
+
+        def print_oldest():
+            path, cache_path, future, is_cached = pending.popleft()
+            try:
+                data = future.result()
+            except Exception as e:
+                # Left uncached, so the next run tries again
+                sys.stderr.write(f"Error parsing {path}: {e}\n")
+                return
+            if not is_cached:
+                store_cached(cache_path, data)
+            write(str(data))
+            write('\n')
+
+        # Misses come out in DAT_SCHEMAS order, minus any not in the GGPK
+        next_extracted = next(extracted, None)
+        for path, field_definitions in DAT_SCHEMAS.items():
+            cache_path = cache_file(cache_dir, path, field_definitions)
+            future = cached.pop(path)
+            is_cached = future is not None
+            if not is_cached:
+                if next_extracted is None or next_extracted[0] != path:
+                    continue  # Not in the GGPK; extract_dat_files_iter warned about it
+                data = next_extracted[1]
+                next_extracted = next(extracted, None)
+                future = executor.submit(parse_dat, data, field_definitions)
+            pending.append((path, cache_path, future, is_cached))
+            # Results are printed in order, so output matches a serial run,
+            # and waiting on the oldest keeps only a few DATs in memory
+            if len(pending) >= MAX_IN_FLIGHT:
+                print_oldest()
+        while pending:
+            print_oldest()
+    sys.stdout.flush()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,76 +1,348 @@
+import os
+import mmap
 import struct
-from typing import Dict, List, Any
+import bisect
+import functools
+import contextlib
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
 
-def parse_ggpk_dat(file_path: str, field_definitions: Dict[str, str]) -> List[Dict[str, Any]]:
+class LazyStr:
     """
-    Parses a Grinding Gear Games .dat64 file into a list of dictionaries.
+    A string from the variable data section that is only decoded from
+    UTF-8 the first time it is used. Compares and hashes like its str value.
+    """
+    __slots__ = ('raw', '_value')
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._value = None
+
+    def __str__(self) -> str:
+        if self._value is None:
+            self._value = self.raw.decode('utf-8')
+        return self._value
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyStr):
+            return self.raw == other.raw
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+class DatTable:
+    """
+    The records of a .dat64 file, stored as one list of values per field
+    rather than one dictionary per record.
+
+    Indexing by field name gives that field's column. Iterating, or
+    to_pylist(), gives the records as dictionaries.
+    """
+    __slots__ = ('columns',)
+
+    def __init__(self, columns: Dict[str, List[Any]]):
+        self.columns = columns
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    @property
+    def num_rows(self) -> int:
+        # Every column has one value per record
+        return len(next(iter(self.columns.values()), ()))
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __getitem__(self, name: str) -> List[Any]:
+        return self.columns[name]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        names = self.column_names
+        for values in zip(*self.columns.values()):
+            yield dict(zip(names, values))
+
+    def __repr__(self) -> str:
+        return f"DatTable({self.num_rows} rows, columns={self.column_names})"
+
+    def to_pydict(self) -> Dict[str, List[Any]]:
+        """Returns the columns, keyed by field name."""
+        return self.columns
+
+    def to_pylist(self) -> List[Dict[str, Any]]:
+        """Returns the records as a list of dictionaries."""
+        return list(self)
+
+@functools.lru_cache(maxsize=256)
+def _record_layout(fields: Tuple[Tuple[str, str], ...]) -> Tuple[struct.Struct, Tuple[str, ...], Tuple[int, ...]]:
+    """
+    Compiles field definitions into a record Struct, the field names and the
+    positions of pointer fields. Cached, since many files share a schema.
+    """
+    # 'P' (string pointer) is stored as a 64-bit offset.
+    format_string = '<' + ''.join(f for _, f in fields).replace('P', 'Q')
+    field_names = tuple(name for name, _ in fields)
+    pointer_indices = tuple(j for j, (_, f) in enumerate(fields) if f == 'P')
+    return struct.Struct(format_string), field_names, pointer_indices
+
+def _index_strings(variable_data_block: bytes) -> Dict[int, bytes]:
+    """
+    Splits the variable data section on null terminators once, mapping the
+    offset of every string to its raw bytes.
+    """
+    strings = {}
+    offset = 0
+    # The last piece has no terminator, so it isn't a complete string
+    for piece in variable_data_block.split(b'\x00')[:-1]:
+        strings[offset] = piece
+        offset += len(piece) + 1
+    return strings
+
+def _build_string_tables(variable_data_block: bytes, lazy_strings: bool) -> Tuple[Dict[int, bytes], Dict[int, Any]]:
+    """Builds the string table and decoded string cache for a variable data section."""
+    # Locate every string up front instead of scanning for each pointer
+    string_table = _index_strings(variable_data_block)
+    # Many rows point at the same few strings, so decode each offset once
+    str_cache: Dict[int, Any] = {}
+    if not lazy_strings:
+        # Decode the whole table in one pass rather than on each lookup
+        decode = bytes.decode
+        for offset, piece in string_table.items():
+            try:
+                str_cache[offset] = decode(piece)
+            except UnicodeDecodeError:
+                # e.g. the 0xBB marker that opens the section; it only matters
+                # if a record points at it, so leave that to the lookup
+                pass
+    return string_table, str_cache
+
+# String tables kept by parses with cache_strings=True, least recently used
+# first. Keyed by a hash of the variable data section (and lazy_strings), so
+# parsing the same file again skips indexing and decoding its strings.
+# Bounded by the tables' estimated size in bytes rather than entry count,
+# as they hold around ten times their section's size.
+_STRING_TABLE_CACHE_LIMIT = 32 * 1024 * 1024
+_string_tables: 'OrderedDict[Tuple[bytes, bool], Tuple[Dict[int, bytes], Dict[int, Any], int]]' = OrderedDict()
+_string_tables_bytes = 0
+_string_tables_lock = threading.Lock()
+
+def _cached_string_tables(variable_data_block: bytes, lazy_strings: bool) -> Tuple[Dict[int, bytes], Dict[int, Any]]:
+    """Like _build_string_tables(), but reuses the tables of a recent parse of the same section."""
+    global _string_tables_bytes
+    key = (hashlib.blake2b(variable_data_block, digest_size=16).digest(), lazy_strings)
+    with _string_tables_lock:
+        tables = _string_tables.get(key)
+        if tables is not None:
+            _string_tables.move_to_end(key)
+            return tables[:2]
+
+    # Built outside the lock, so other threads' parses aren't held up
+    string_table, str_cache = _build_string_tables(variable_data_block, lazy_strings)
+
+    # The raw and decoded copies of the text, plus roughly 200 bytes of
+    # object and dict overhead per string
+    size = 2 * len(variable_data_block) + 200 * len(string_table)
+    if size <= _STRING_TABLE_CACHE_LIMIT:
+        with _string_tables_lock:
+            if key not in _string_tables:
+                _string_tables[key] = (string_table, str_cache, size)
+                _string_tables_bytes += size
+                while _string_tables_bytes > _STRING_TABLE_CACHE_LIMIT:
+                    _, (_, _, evicted) = _string_tables.popitem(last=False)
+                    _string_tables_bytes -= evicted
+    return string_table, str_cache
+
+class _DatFile:
+    """
+    A mapped .dat64 file, decoded against a set of field definitions.
+    Pointer ('P') fields are resolved to strings from the variable data section.
+    """
+
+    def __init__(self, mm: mmap.mmap, field_definitions: Dict[str, str], lazy_strings: bool,
+                 cache_strings: bool = False):
+        self.mm = mm
+
+        # The first 8 bytes of a .dat64 file typically contain the record count.
+        record_count = struct.unpack_from('<Q', mm, 0)[0]
+        
+        # The next 8 bytes often contain the width of a single record.
+        record_width = struct.unpack_from('<Q', mm, 8)[0]
+        
+        # The rest of the file before the variable-length data section contains the records.
+        # This section's size is record_count * record_width.
+        # The remainder is the variable-length data section (e.g., strings).
+        self.var_start = 16 + record_count * record_width
+
+        self.record_struct, self.field_names, self.pointer_indices = _record_layout(tuple(field_definitions.items()))
+        
+        # Verify that the provided definitions match the record width
+        if self.record_struct.size != record_width:
+            raise ValueError(
+                f"Field definition size ({self.record_struct.size}) "
+                f"does not match file record width ({record_width})."
+            )
+        if len(mm) < self.var_start:
+            raise ValueError(
+                f"Record data is {len(mm) - 16} bytes, "
+                f"expected {record_count * record_width}."
+            )
+
+        if cache_strings:
+            # Strings resolved here are added to the shared cache too; they only
+            # depend on the variable data section, so that's safe
+            self.string_table, self.str_cache = _cached_string_tables(mm[self.var_start:], lazy_strings)
+        else:
+            self.string_table, self.str_cache = _build_string_tables(mm[self.var_start:], lazy_strings)
+        self.to_str = LazyStr if lazy_strings else bytes.decode
+        # Sorted null terminator positions, built on first use
+        self._string_ends: Optional[List[int]] = None
+        # Index into _string_ends of the last terminator found
+        self._string_cursor = 0
+
+    def _resolve(self, str_offset: int) -> Any:
+        """Decodes the string at an offset into the variable data section and caches it."""
+        piece = self.string_table.get(str_offset)
+        if piece is None:
+            # Not the start of a string (e.g. points into the middle of one),
+            # read up to the next null terminator instead
+            string_ends = self._string_ends
+            if string_ends is None:
+                # Strings are indexed in offset order, so their terminators are sorted
+                string_ends = self._string_ends = [
+                    offset + len(piece) for offset, piece in self.string_table.items()
+                ]
+            start = self.var_start + str_offset
+            k = self._string_cursor
+            if k < len(string_ends) and (k == 0 or string_ends[k - 1] < str_offset):
+                # Offsets are mostly written in increasing order, so the terminator
+                # is usually the one at the cursor or the next
+                if string_ends[k] < str_offset:
+                    k += 1
+                    if k < len(string_ends) and string_ends[k] < str_offset:
+                        k = bisect.bisect_left(string_ends, str_offset, k + 1)
+            else:
+                k = bisect.bisect_left(string_ends, str_offset, 0, k)
+            self._string_cursor = k
+            # Past the last terminator, keep the old find() == -1 behaviour of
+            # dropping the final byte
+            end_of_string = self.var_start + string_ends[k] if k < len(string_ends) else -1
+            piece = self.mm[start:end_of_string]
+        value = self.str_cache[str_offset] = self.to_str(piece)
+        return value
+
+    def columns(self) -> Dict[str, List[Any]]:
+        """Decodes every field into a list of values, one per record."""
+        record_data_block = memoryview(self.mm)[16:self.var_start]
+        try:
+            # Transposing the unpacked records in C gives one tuple per field
+            columns = list(zip(*self.record_struct.iter_unpack(record_data_block)))
+        finally:
+            record_data_block.release()
+        if not columns:
+            return {name: [] for name in self.field_names}
+
+        str_cache = self.str_cache
+        for j in self.pointer_indices:
+            column = columns[j]
+            # Resolve each distinct pointer once (in offset order, so the terminator
+            # cursor only moves forward), then translate the whole column in C
+            for str_offset in sorted(set(column).difference(str_cache)):
+                self._resolve(str_offset)
+            columns[j] = map(str_cache.__getitem__, column)
+        return {name: list(column) for name, column in zip(self.field_names, columns)}
+
+@contextlib.contextmanager
+def _open_dat(source: Union[str, bytes, bytearray, memoryview]) -> Iterator[Optional[Any]]:
+    """
+    Yields the contents of a .dat64 file as a buffer, or None if it is empty.
+    A path is mapped read-only for the duration; in-memory contents are used as is.
+    """
+    if not isinstance(source, str):
+        # Slices of the buffer must be bytes for splitting and decoding
+        yield (source if isinstance(source, bytes) else bytes(source)) or None
+        return
+
+    with open(source, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            mm = None  # An empty file can't be mapped
+        else:
+            # Map the file rather than reading it, so neither block is copied
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield mm
+    finally:
+        if mm is not None:
+            mm.close()
+
+def parse_ggpk_dat(file_path: Union[str, bytes, memoryview], field_definitions: Dict[str, str],
+                   lazy_strings: bool = False, strict: bool = False,
+                   cache_strings: bool = False) -> DatTable:
+    """
+    Parses a Grinding Gear Games .dat64 file into a table.
 
     Args:
-        file_path: The full path to the .dat64 file.
+        file_path: The full path to the .dat64 file, or its contents
+                   (e.g. as extracted straight from the GGPK).
         field_definitions: A dictionary defining the names and struct format
                            specifiers for the fields in each record.
+        lazy_strings: If True, string fields are returned as LazyStr objects
+                      that are only decoded when used. Decoding errors then
+                      surface at that point instead of during parsing.
+        strict: If True, errors are raised rather than printed, so a failed
+                parse can't be mistaken for a file with no records.
+        cache_strings: If True, the indexed and decoded strings are kept (up
+                       to _STRING_TABLE_CACHE_LIMIT bytes in total) and reused
+                       when a file with the same string data is parsed again.
+                       Only worth it for callers that re-parse files, as every
+                       parse then also hashes its string data.
 
     Returns:
-        A list of dictionaries, where each dictionary represents a record.
+        A DatTable of the records; call to_pylist() for a list of
+        dictionaries. The table is empty if an error occurs.
+    """
+    return DatTable(parse_ggpk_dat_columns(file_path, field_definitions, lazy_strings, strict, cache_strings))
+
+def parse_ggpk_dat_columns(file_path: Union[str, bytes, memoryview], field_definitions: Dict[str, str],
+                           lazy_strings: bool = False, strict: bool = False,
+                           cache_strings: bool = False) -> Dict[str, List[Any]]:
+    """
+    Parses a Grinding Gear Games .dat64 file into columns. Each distinct
+    string is resolved once, and no per-record dictionaries are built.
+
+    Args:
+        file_path: The full path to the .dat64 file, or its contents.
+        field_definitions: A dictionary defining the names and struct format
+                           specifiers for the fields in each record.
+        lazy_strings: See parse_ggpk_dat().
+        strict: See parse_ggpk_dat().
+        cache_strings: See parse_ggpk_dat().
+
+    Returns:
+        A dictionary mapping each field name to a list of its values, in
+        record order. Returns an empty dictionary if an error occurs.
     """
-    records = []
     try:
-        with open(file_path, 'rb') as f:
-            # The first 8 bytes of a .dat64 file typically contain the record count.
-            record_count_bytes = f.read(8)
-            if not record_count_bytes:
-                return []  # File is empty
-            
-            record_count = struct.unpack('<Q', record_count_bytes)[0]
-            
-            # The next 8 bytes often contain the width of a single record.
-            record_width_bytes = f.read(8)
-            record_width = struct.unpack('<Q', record_width_bytes)[0]
-            
-            # The rest of the file before the variable-length data section contains the records.
-            # This section's size is record_count * record_width.
-            record_data_block = f.read(record_count * record_width)
-            
-            # The remainder is the variable-length data section (e.g., strings).
-            variable_data_block = f.read()
-
-            # Create the format string for struct.unpack from the field definitions
-            format_string = '<' + ''.join(field_definitions.values())
-            
-            # Verify that the provided definitions match the record width
-            if struct.calcsize(format_string) != record_width:
-                raise ValueError(
-                    f"Field definition size ({struct.calcsize(format_string)}) "
-                    f"does not match file record width ({record_width})."
-                )
-
-            field_names = list(field_definitions.keys())
-
-            for i in range(record_count):
-                offset = i * record_width
-                record_bytes = record_data_block[offset : offset + record_width]
-                
-                unpacked_data = struct.unpack(format_string, record_bytes)
-                
-                record_dict = {}
-                for j, name in enumerate(field_names):
-                    value = unpacked_data[j]
-                    # 'P' format gives an offset into the variable_data_block
-                    if field_definitions[name] == 'P':
-                        # Read the null-terminated string from the variable data block
-                        str_offset = value
-                        end_of_string = variable_data_block.find(b'\x00', str_offset)
-                        value = variable_data_block[str_offset:end_of_string].decode('utf-8')
-
-                    record_dict[name] = value
-                
-                records.append(record_dict)
+        with _open_dat(file_path) as buf:
+            if buf is None:
+                return {}  # File is empty
+            return _DatFile(buf, field_definitions, lazy_strings, cache_strings).columns()
 
     except FileNotFoundError:
+        if strict:
+            raise
         print(f"❌ Error: The file at {file_path} was not found.")
-        return []
+        return {}
     except Exception as e:
+        if strict:
+            raise
         print(f"An error occurred: {e}")
-        return []
-        
-    return records
\ No newline at end of file
+        return {}